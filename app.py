@@ -10,6 +10,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
+import time
 import matplotlib.pyplot as plt
 from datetime import datetime
 import json
@@ -36,11 +37,54 @@ market_price_override = st.sidebar.number_input(
 )
 use_live_price = st.sidebar.checkbox("Fetch live price (yfinance)", value=True)
 
-@st.cache_data(ttl=300)
+LIVE_PRICE_TTL_SECONDS = 300
+LAST_PRICE_PATH = os.path.join(".streamlit", "last_live_price.json")
+
+def load_last_price(ticker_symbol: str):
+    """Return {"price", "fetched_at"} last saved for ticker_symbol, or None (missing or unusable entry)."""
+    try:
+        with open(LAST_PRICE_PATH) as f:
+            last = json.load(f).get(ticker_symbol)
+        price, fetched_at = float(last["price"]), float(last["fetched_at"])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    if not (np.isfinite(price) and np.isfinite(fetched_at)):
+        return None
+    return {"price": price, "fetched_at": fetched_at}
+
+def save_last_price(ticker_symbol: str, price: float):
+    """Record the latest price per ticker (one entry each, overwritten) via temp file + os.replace.
+    Best-effort: an unwritable cache dir (e.g. read-only container) is ignored."""
+    try:
+        with open(LAST_PRICE_PATH) as f:
+            prices = json.load(f)
+    except (OSError, ValueError):
+        prices = {}
+    prices[ticker_symbol] = {"price": price, "fetched_at": time.time()}
+    try:
+        os.makedirs(os.path.dirname(LAST_PRICE_PATH), exist_ok=True)
+        tmp_path = f"{LAST_PRICE_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(prices, f)
+        os.replace(tmp_path, LAST_PRICE_PATH)
+    except OSError:
+        pass
+
+# in-memory cache per worker; the last-price file lets a restarted worker skip
+# yfinance while that price is still within the TTL
+@st.cache_data(ttl=LIVE_PRICE_TTL_SECONDS)
 def fetch_live_price(ticker_symbol: str):
+    last = load_last_price(ticker_symbol)
+    if last is not None and time.time() - last["fetched_at"] < LIVE_PRICE_TTL_SECONDS:
+        return float(last["price"])
     t = yf.Ticker(ticker_symbol)
-    h = t.history(period="2d")
-    return float(h["Close"].dropna().iloc[-1])
+    h = t.history(period="1d")
+    price = float(h.tail(1)["Close"].iloc[0])
+    if not np.isfinite(price):
+        # partial / not-yet-traded bar: let the caller fall back instead of using NaN
+        raise ValueError(f"no valid close for {ticker_symbol}: {price}")
+    save_last_price(ticker_symbol, price)
+    return price
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("This app **only loads precomputed** Monte Carlo results. To regenerate MC, run the provided notebook/script.")
@@ -48,10 +92,25 @@ st.sidebar.markdown("This app **only loads precomputed** Monte Carlo results. To
 # ---- Helpers ----
 # ----------------- REPLACE THESE FUNCTIONS IN app.py -----------------
 
-def load_forecast_csvs(forecasts_dir="outputs/forecasts"):
-    """Load base/bull/bear CSVs if present, else return None for each."""
+FORECAST_FILES = {"Base": "base_case.csv", "Bull": "bull_case.csv", "Bear": "bear_case.csv"}
+
+def file_stamps(*paths):
+    """(inode, mtime_ns, size) per path (None if missing); passed to cached loaders so a rewritten file is a new cache key."""
+    stamps = []
+    for path in paths:
+        try:
+            st_ = os.stat(path)
+            stamps.append((st_.st_ino, st_.st_mtime_ns, st_.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+@st.cache_data(ttl=3600)
+def load_forecast_csvs(forecasts_dir="outputs/forecasts", file_stamp=None):
+    """Load base/bull/bear CSVs if present, else return None for each.
+    file_stamp only keys the cache: pass file_stamps(...) of the CSVs."""
     out = {}
-    mapping = {"Base": "base_case.csv", "Bull": "bull_case.csv", "Bear": "bear_case.csv"}
+    mapping = FORECAST_FILES
     for name, fname in mapping.items():
         path = os.path.join(forecasts_dir, fname)
         if os.path.exists(path):
@@ -90,46 +149,51 @@ def plot_forecasts(forecasts):
     if not any(v is not None for v in forecasts.values()):
         st.info("No forecast CSVs to plot.")
         return
-    plt.figure(figsize=(9,4))
+    fig, ax = plt.subplots(figsize=(9,4))
     for name, df in forecasts.items():
         if df is None:
             continue
         if "Revenue" in df.columns:
             x = df.index
-            plt.plot(x, df["Revenue"], label=f"{name} Revenue")
-    plt.title("Revenue Forecast (from CSVs)")
-    plt.xlabel("Year")
-    plt.ylabel("Revenue")
-    plt.legend()
-    st.pyplot(plt.gcf())
-    plt.close()
+            ax.plot(x, df["Revenue"], label=f"{name} Revenue")
+    ax.set_title("Revenue Forecast (from CSVs)")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Revenue")
+    ax.legend()
+    st.pyplot(fig)
+    plt.close(fig)
 
 def plot_fcff(forecasts):
     # defensive: only plot if at least one non-None dataframe has FCFF
     if not any((df is not None and "FCFF" in df.columns) for df in forecasts.values()):
         # nothing to plot
         return
-    plt.figure(figsize=(9,4))
+    fig, ax = plt.subplots(figsize=(9,4))
     for name, df in forecasts.items():
         if df is None:
             continue
         if "FCFF" in df.columns:
-            plt.plot(df.index, df["FCFF"], label=f"{name} FCFF")
-    plt.title("FCFF (from CSVs)")
-    plt.xlabel("Year")
-    plt.ylabel("FCFF")
-    plt.legend()
-    st.pyplot(plt.gcf())
-    plt.close()
+            ax.plot(df.index, df["FCFF"], label=f"{name} FCFF")
+    ax.set_title("FCFF (from CSVs)")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FCFF")
+    ax.legend()
+    st.pyplot(fig)
+    plt.close(fig)
     
-def load_canonical_mc(out_dir="outputs/mc"):
-    """Return ev_eur array (np.ndarray) and metadata dict (if available)."""
+# cache_resource: the memmap is shared as-is rather than pickled per rerun.
+# file_stamp keys the mapping on the file's identity: if the .npy is rewritten, the
+# next rerun maps the new file instead of reading a stale (possibly truncated) mapping.
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_canonical_mc(out_dir="outputs/mc", file_stamp=None):
+    """Return ev_eur array (read-only np.memmap) and metadata dict (if available).
+    file_stamp only keys the cache: pass file_stamps(...) of the .npy and metadata files."""
     ev_path = os.path.join(out_dir, "mc_values_live_eur.npy")
     metrics_csv = os.path.join(out_dir, "mc_last_run.csv")
     metrics_json = os.path.join(out_dir, "mc_metrics.json")
     if not os.path.exists(ev_path):
         return None, None
-    ev_eur = np.load(ev_path)
+    ev_eur = np.load(ev_path, mmap_mode="r")
     meta = None
     if os.path.exists(metrics_csv):
         try:
@@ -143,28 +207,48 @@ def load_canonical_mc(out_dir="outputs/mc"):
             meta = None
     return ev_eur, meta
 
+def percentile_sorted(sorted_arr, q):
+    """np.percentile(..., method="lower") for an already ascending-sorted array: a single gather, no interpolation."""
+    idx = (np.asarray(q, dtype=float) / 100.0 * (len(sorted_arr) - 1)).astype(np.intp)
+    return sorted_arr[idx]
+
+def equal_width_histogram(values, lo, hi, bins=80):
+    """Histogram over [lo, hi] via np.bincount; values outside are clipped into the end bins."""
+    if hi <= lo:
+        # same fallback range np.histogram uses for a degenerate range
+        lo, hi = lo - 0.5, hi + 0.5
+    idx = ((values - lo) * (bins / (hi - lo))).astype(np.intp)
+    np.clip(idx, 0, bins - 1, out=idx)
+    counts = np.bincount(idx, minlength=bins)
+    edges = np.linspace(lo, hi, bins + 1)
+    return counts, edges
+
 def compute_and_display_mc(ev_eur, shares_units, market_price, clip_pct=99):
     """Compute KPIs from ev_eur (full EUR) and display them + clipped histogram."""
-    clean = ev_eur[~np.isnan(ev_eur)]
-    if clean.size == 0:
+    # sort once (the only full-size copy of the memmap); NaNs sort to the end, so
+    # the clean values are a prefix view and every statistic below reads from it
+    ev_sorted = np.sort(np.asarray(ev_eur))
+    n = int(np.searchsorted(ev_sorted, np.nan))
+    if n == 0:
         st.error("MC file contains no valid values.")
         return None
+    clean_sorted = ev_sorted[:n]
 
-    qs = np.percentile(clean, [5,25,50,75,95])
+    qs = percentile_sorted(clean_sorted, [5,25,50,75,95])
     ev_median = float(qs[2])
-    ev_mean = float(clean.mean())
+    ev_mean = float(clean_sorted.mean(dtype=np.float64))
     ev_5 = float(qs[0])
     ev_95 = float(qs[4])
 
-    # per-share
-    ps_array = clean / float(shares_units)
-    median_ps = float(np.percentile(ps_array,50))
-    mean_ps = float(np.nanmean(ps_array))
-    prob_above = float(np.nanmean((ps_array > market_price).astype(float))) if market_price is not None else None
+    # per-share (dividing by a positive constant keeps the sort order)
+    ps_sorted = clean_sorted / float(shares_units)
+    median_ps = float(percentile_sorted(ps_sorted, 50))
+    mean_ps = float(ps_sorted.mean(dtype=np.float64))
+    prob_above = float(1.0 - np.searchsorted(ps_sorted, market_price, side="right") / n) if market_price is not None else None
 
     # CVaR 5% on EV
-    k = max(1, int(0.05 * len(clean)))
-    cvar5 = float(np.sort(clean)[:k].mean())
+    k = max(1, int(0.05 * n))
+    cvar5 = float(clean_sorted[:k].mean(dtype=np.float64))
 
     # KPI row
     k1, k2, k3, k4 = st.columns(4)
@@ -177,11 +261,11 @@ def compute_and_display_mc(ev_eur, shares_units, market_price, clip_pct=99):
     st.write(f"Debug: median_ev_eur={ev_median:.0f}, median_per_share={median_ps:.4f}, market_price={market_price}")
 
     # plot clipped per-share histogram
-    clip_val = np.percentile(ps_array, clip_pct)
-    plot_data = np.minimum(ps_array, clip_val)
+    clip_val = percentile_sorted(ps_sorted, clip_pct)
+    counts, edges = equal_width_histogram(ps_sorted, ps_sorted[0], clip_val, bins=80)
 
     fig, ax = plt.subplots(figsize=(10,5))
-    ax.hist(plot_data, bins=80)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
     ax.axvline(median_ps, color="C1", linestyle="--", label=f"Median €{median_ps:,.2f}")
     if market_price is not None:
         ax.axvline(market_price, color="C3", linestyle="-.", label=f"Market €{market_price:.2f}")
@@ -216,7 +300,11 @@ st.markdown(
 
 # Forecasts
 st.header("Forecasts")
-forecasts = load_forecast_csvs()
+forecasts_dir = "outputs/forecasts"
+forecasts = load_forecast_csvs(
+    forecasts_dir,
+    file_stamp=file_stamps(*(os.path.join(forecasts_dir, f) for f in FORECAST_FILES.values()))
+)
 display_forecast_tables(forecasts)
 st.subheader("Scenario charts")
 plot_forecasts(forecasts)
@@ -224,7 +312,11 @@ plot_fcff(forecasts)
 
 # Monte Carlo
 st.header("Monte Carlo results (precomputed)")
-ev_eur, meta = load_canonical_mc()
+mc_dir = "outputs/mc"
+ev_eur, meta = load_canonical_mc(
+    mc_dir,
+    file_stamp=file_stamps(*(os.path.join(mc_dir, f) for f in ("mc_values_live_eur.npy", "mc_last_run.csv", "mc_metrics.json")))
+)
 if ev_eur is None:
     st.error("Canonical MC file not found: outputs/mc/mc_values_live_eur.npy\n\nRun the notebook/script to regenerate canonical MC outputs.")
 else:
@@ -239,8 +331,14 @@ else:
             market_price_used = 0.0
             market_price_source = "fallback"
     except Exception:
-        market_price_used = float(market_price_override) if market_price_override is not None else 0.0
-        market_price_source = "fallback/manual"
+        last = load_last_price(ticker) if use_live_price else None
+        if last is not None:
+            market_price_used = float(last["price"])
+            fetched = datetime.fromtimestamp(last["fetched_at"]).strftime("%Y-%m-%d %H:%M")
+            market_price_source = f"last known yfinance price, fetched {fetched}"
+        else:
+            market_price_used = float(market_price_override) if market_price_override is not None else 0.0
+            market_price_source = "fallback/manual"
 
     metrics = compute_and_display_mc(ev_eur, shares_outstanding, market_price_used, clip_pct=99)
 
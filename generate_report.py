@@ -1,4 +1,4 @@
-import os, json, numpy as np, pandas as pd
+import os, json, hashlib, inspect, numpy as np, pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 
@@ -11,19 +11,28 @@ bull_csv = os.path.join(project_root, "outputs", "forecasts", "bull_case.csv")
 bear_csv = os.path.join(project_root, "outputs", "forecasts", "bear_case.csv")
 mc_np = os.path.join(project_root, "outputs", "mc", "mc_values_live_eur.npy")
 
-base_df = pd.read_csv(base_csv, index_col=0) if os.path.exists(base_csv) else None
-bull_df = pd.read_csv(bull_csv, index_col=0) if os.path.exists(bull_csv) else None
-bear_df = pd.read_csv(bear_csv, index_col=0) if os.path.exists(bear_csv) else None
+def load_forecast_csv(path):
+    if not os.path.exists(path):
+        return None
+    df = pd.read_csv(path, index_col=0)
+    df.index = df.index.astype(int)  # cast once; plots reuse the int year index
+    return df
+
+base_df = load_forecast_csv(base_csv)
+bull_df = load_forecast_csv(bull_csv)
+bear_df = load_forecast_csv(bear_csv)
 
 if os.path.exists(mc_np):
-    ev_eur = np.load(mc_np)
-    ev_clean = ev_eur[~np.isnan(ev_eur)]
+    ev_eur = np.load(mc_np, mmap_mode="r")
+    # one sorted copy; NaNs sort last so the clean values are a prefix view
+    ev_sorted = np.sort(np.asarray(ev_eur))
+    ev_clean = ev_sorted[:np.searchsorted(ev_sorted, np.nan)]
 else:
     ev_clean = np.array([])
 
-def plot_forecast_table(df, title, fname):
+def plot_forecast_table(df, title):
     if df is None:
-        return
+        return None
     fig, ax = plt.subplots(figsize=(10, 2.2))
     ax.axis('off')
     display_df = df.copy().round(0)
@@ -36,73 +45,122 @@ def plot_forecast_table(df, title, fname):
     )
     table.auto_set_font_size(False)
     table.set_fontsize(8)
-    plt.title(title, fontsize=10)
-    plt.savefig(fname, bbox_inches='tight', dpi=150)
-    plt.close(fig)
-
-plot_forecast_table(base_df, "Forecast – Base case", os.path.join(out_reports, "forecast_table_base.png"))
+    ax.set_title(title, fontsize=10)
+    return fig
 
-def plot_scenario_lines(dfs, series, fname):
+def plot_scenario_lines(dfs, series):
     fig, ax = plt.subplots(figsize=(9, 4))
     for name, df in dfs.items():
         if df is not None and series in df.columns:
-            ax.plot(df.index.astype(int), df[series], marker='o', label=name)
+            ax.plot(df.index.to_numpy(), df[series].to_numpy(), marker='o', label=name)
     ax.set_title(f"{series} – Scenarios")
     ax.set_xlabel("Year")
     ax.set_ylabel(series)
     ax.legend()
-    fig.savefig(fname, bbox_inches='tight', dpi=150)
-    plt.close(fig)
-
-plot_scenario_lines(
-    {"Base": base_df, "Bull": bull_df, "Bear": bear_df},
-    "Revenue",
-    os.path.join(out_reports, "scenario_revenue.png")
-)
-
-plot_scenario_lines(
-    {"Base": base_df, "Bull": bull_df, "Bear": bear_df},
-    "FCFF",
-    os.path.join(out_reports, "scenario_fcff.png")
-)
+    return fig
 
-shares_units = 388_150_000
-market_price = 869  # fallback
-
-if ev_clean.size > 0:
-    ps_array = ev_clean / shares_units
-    median_ps = np.percentile(ps_array, 50)
+def plot_mc_hist(ev_sorted, median_ps):
+    # bin in EV space and rescale the edges, so no per-share copy of the array is made
+    counts, edges = np.histogram(ev_sorted, bins=100)
+    edges_ps = edges / shares_units
     fig, ax = plt.subplots(figsize=(9, 4))
-    ax.hist(ps_array, bins=100, alpha=0.9)
+    ax.hist(edges_ps[:-1], bins=edges_ps, weights=counts, alpha=0.9)
     ax.axvline(median_ps, color="red", linestyle="--", label=f"Median €{median_ps:,.2f}")
     ax.axvline(market_price, color="green", linestyle="-.", label=f"Market €{market_price:.2f}")
     ax.legend()
     ax.set_title("Monte Carlo intrinsic value (EUR/share)")
-    fig.savefig(os.path.join(out_reports, "mc_hist_ps.png"), bbox_inches='tight', dpi=150)
-    plt.close(fig)
+    return fig
+
+# ---- PNG cache: one input digest per PNG in outputs/reports/.stamp ----
+stamp_path = os.path.join(out_reports, ".stamp")
+try:
+    with open(stamp_path) as f:
+        stamps = json.load(f)
+except (OSError, ValueError):
+    stamps = {}
+
+# bump when shared rendering settings change (e.g. savefig dpi/bbox in save_png_if_stale)
+RENDER_VERSION = 1
+
+def source_digest(paths, plot_fn, *params):
+    """sha256 over the bytes of `paths` (missing files included as such), the source of
+    plot_fn, RENDER_VERSION and plot params, so code changes also invalidate the PNG."""
+    h = hashlib.sha256()
+    h.update(f"render-v{RENDER_VERSION}".encode())
+    h.update(inspect.getsource(plot_fn).encode())
+    for path in paths:
+        h.update(os.path.basename(path).encode())
+        if not os.path.exists(path):
+            h.update(b"<missing>")
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    for param in params:
+        h.update(repr(param).encode())
+    return h.hexdigest()
+
+def png_is_fresh(fname, digest):
+    return os.path.exists(fname) and stamps.get(os.path.basename(fname)) == digest
+
+def save_png_if_stale(fig, fname, digest):
+    """Write fig to fname unless fname exists and was last written from the same digest."""
+    if fig is None or png_is_fresh(fname, digest):
+        return
+    fig.savefig(fname, bbox_inches='tight', dpi=150)
+    stamps[os.path.basename(fname)] = digest
 
+shares_units = 388_150_000
+market_price = 869  # fallback
+
+scenario_csvs = [base_csv, bull_csv, bear_csv]
+scenario_dfs = {"Base": base_df, "Bull": bull_df, "Bear": bear_df}
+
+# Figures that go into the PDF are built every run; PNG export is skipped when unchanged
+fig_table = plot_forecast_table(base_df, "Forecast – Base case")
+save_png_if_stale(fig_table, os.path.join(out_reports, "forecast_table_base.png"), source_digest([base_csv], plot_forecast_table))
+
+fig_fcff = plot_scenario_lines(scenario_dfs, "FCFF")
+save_png_if_stale(fig_fcff, os.path.join(out_reports, "scenario_fcff.png"), source_digest(scenario_csvs, plot_scenario_lines, "FCFF"))
+
+# Revenue is PNG-only, so only build it when the PNG is stale
+revenue_png = os.path.join(out_reports, "scenario_revenue.png")
+revenue_digest = source_digest(scenario_csvs, plot_scenario_lines, "Revenue")
+if not png_is_fresh(revenue_png, revenue_digest):
+    fig_revenue = plot_scenario_lines(scenario_dfs, "Revenue")
+    save_png_if_stale(fig_revenue, revenue_png, revenue_digest)
+    plt.close(fig_revenue)
+
+fig_hist = None
+if ev_clean.size > 0:
+    # ev_clean is sorted: nearest-rank median and Prob(> market) come straight from it
+    n = ev_clean.size
+    median_ev = float(ev_clean[(n - 1) // 2])
+    median_ps = median_ev / shares_units
+    prob_above = 1.0 - np.searchsorted(ev_clean, market_price * shares_units, side="right") / n
+    fig_hist = plot_mc_hist(ev_clean, median_ps)
+    save_png_if_stale(
+        fig_hist,
+        os.path.join(out_reports, "mc_hist_ps.png"),
+        source_digest([mc_np], plot_mc_hist, shares_units, market_price)
+    )
+
+with open(stamp_path, "w") as f:
+    json.dump(stamps, f, indent=2)
+
+# Figures are written straight into the PDF as vector pages (no PNG imread/imshow round-trip)
 pdf_path = os.path.join(out_reports, "report.pdf")
 with PdfPages(pdf_path) as pdf:
     fig = plt.figure(figsize=(11.7, 8.3))
     fig.text(0.05, 0.92, "Valuation Executive Summary", fontsize=16, weight='bold')
 
     if ev_clean.size > 0:
-        median_ev = np.percentile(ev_clean, 50)
-        prob_above = (ev_clean / shares_units > market_price).mean()
         kpi_text = f"Median EV: €{median_ev:,.0f}\nMedian per-share: €{median_ps:,.2f}\nProb > market: {prob_above*100:.2f}%"
     else:
         kpi_text = "No MC results found"
 
     fig.text(0.05, 0.82, kpi_text, fontsize=10)
 
-    img1 = plt.imread(os.path.join(out_reports, "forecast_table_base.png"))
-    img2 = plt.imread(os.path.join(out_reports, "mc_hist_ps.png"))
-    img3 = plt.imread(os.path.join(out_reports, "scenario_fcff.png"))
-
-    ax1 = fig.add_axes([0.05, 0.35, 0.55, 0.45]); ax1.imshow(img1); ax1.axis('off')
-    ax2 = fig.add_axes([0.62, 0.5, 0.35, 0.4]); ax2.imshow(img2); ax2.axis('off')
-    ax3 = fig.add_axes([0.62, 0.05, 0.35, 0.35]); ax3.imshow(img3); ax3.axis('off')
-
     fig.text(0.05, 0.02, "Insights:", fontsize=10, weight='bold')
     fig.text(0.15, 0.02,
              "1. Median intrinsic relative to market.\n"
@@ -113,4 +171,9 @@ with PdfPages(pdf_path) as pdf:
     pdf.savefig(fig)
     plt.close(fig)
 
+    for page in (fig_table, fig_hist, fig_fcff):
+        if page is not None:
+            pdf.savefig(page, bbox_inches='tight')
+            plt.close(page)
+
 print("DONE — PDF saved to:", pdf_path)
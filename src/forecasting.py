@@ -7,10 +7,13 @@ Functions:
 - project_revenue(last_value, base_growth, years)
 - project_margin(base_margin, delta)
 - build_forecast(last_revenue, growth, ebitda_margin, capex_pct, dep_pct, wc_pct, tax_rate, years)
+- build_forecasts_batch(last_revenue, growths, margins, capex_pcts, dep_pcts, wc_pcts, tax_rates, years)
+- split_forecast_batch(batch, names, start_year)
 - build_scenario_from_base(base_last_rev, base_growth, base_margin, growth_mul, margin_delta, capex_mul, dep_pct, wc_pct, tax_rate, years)
 """
 
-from typing import Iterable
+from typing import Dict, Iterable
+import numpy as np
 import pandas as pd
 
 
@@ -30,7 +33,7 @@ def compute_cagr(values: Iterable[float], periods: int) -> float:
 def project_revenue(last_value: float, growth_rate: float, years: int) -> pd.Series:
     """Project revenue given last known value, constant growth rate and number of years.
     Returns a pandas Series indexed 1..years (you can reindex later to actual years)."""
-    arr = [last_value * (1 + growth_rate) ** i for i in range(1, years + 1)]
+    arr = last_value * np.power(1.0 + growth_rate, np.arange(1, years + 1))
     return pd.Series(arr)
 
 
@@ -39,6 +42,55 @@ def project_margin(base_margin: float, delta: float = 0.0) -> float:
     return base_margin + delta
 
 
+FORECAST_COLUMNS = [
+    "Revenue",
+    "EBITDA",
+    "Depreciation",
+    "EBIT",
+    "NOPAT",
+    "Capex",
+    "ΔWorkingCapital",
+    "FCFF",
+]
+
+
+def _build_forecast_arrays(
+    last_revenue: float,
+    growth,
+    ebitda_margin,
+    capex_pct,
+    dep_pct,
+    wc_pct,
+    tax_rate,
+    years: int,
+) -> Dict[str, np.ndarray]:
+    """NumPy core of build_forecast: returns {column name: array of length `years`}.
+    Drivers may also be length-k arrays (one entry per scenario), giving (k, years) arrays."""
+    growth, ebitda_margin, capex_pct, dep_pct, wc_pct, tax_rate = (
+        np.asarray(x, dtype=float)[..., None]
+        for x in (growth, ebitda_margin, capex_pct, dep_pct, wc_pct, tax_rate)
+    )
+    rev = last_revenue * np.power(1.0 + growth, np.arange(1, years + 1))
+    ebitda = rev * ebitda_margin
+    dep = rev * dep_pct
+    ebit = ebitda - dep
+    nopat = ebit * (1 - tax_rate)
+    capex = rev * capex_pct
+    wc = rev * wc_pct
+    fcff = nopat + dep - capex - wc
+    return dict(zip(FORECAST_COLUMNS, (rev, ebitda, dep, ebit, nopat, capex, wc, fcff)))
+
+
+def _forecast_frame(arrays: Dict[str, np.ndarray], years: int, start_year: int = None) -> pd.DataFrame:
+    """Wrap one scenario's forecast arrays in the build_forecast DataFrame layout."""
+    df = pd.DataFrame(arrays, columns=FORECAST_COLUMNS)
+
+    if start_year is not None:
+        years_index = [start_year + i for i in range(1, years + 1)]
+        df.index = years_index
+    return df
+
+
 def build_forecast(
     last_revenue: float,
     growth: float,
@@ -52,32 +104,41 @@ def build_forecast(
 ) -> pd.DataFrame:
     """Build a deterministic forecast table for `years` years.
     Returns DataFrame indexed by year numbers (if start_year provided uses actual years)."""
-    rev = project_revenue(last_revenue, growth, years)
-    ebitda = rev * ebitda_margin
-    dep = rev * dep_pct
-    ebit = ebitda - dep
-    nopat = ebit * (1 - tax_rate)
-    capex = rev * capex_pct
-    wc = rev * wc_pct
-    fcff = nopat + dep - capex - wc
+    arrays = _build_forecast_arrays(
+        last_revenue, growth, ebitda_margin, capex_pct, dep_pct, wc_pct, tax_rate, years
+    )
+    return _forecast_frame(arrays, years, start_year)
 
-    df = pd.DataFrame(
-        {
-            "Revenue": rev,
-            "EBITDA": ebitda,
-            "Depreciation": dep,
-            "EBIT": ebit,
-            "NOPAT": nopat,
-            "Capex": capex,
-            "ΔWorkingCapital": wc,
-            "FCFF": fcff,
-        }
+
+def build_forecasts_batch(
+    last_revenue: float,
+    growths: Iterable[float],
+    margins: Iterable[float],
+    capex_pcts: Iterable[float],
+    dep_pcts: Iterable[float],
+    wc_pcts: Iterable[float],
+    tax_rates: Iterable[float],
+    years: int,
+) -> Dict[str, np.ndarray]:
+    """Build k scenarios in one vectorized pass from length-k driver sequences
+    (scalars are broadcast; all-scalar drivers give k=1). Returns {column name: (k, years) array}."""
+    arrays = _build_forecast_arrays(
+        last_revenue, growths, margins, capex_pcts, dep_pcts, wc_pcts, tax_rates, years
     )
+    return {col: np.atleast_2d(arr) for col, arr in arrays.items()}
 
-    if start_year is not None:
-        years_index = [start_year + i for i in range(1, years + 1)]
-        df.index = years_index
-    return df
+
+def split_forecast_batch(
+    batch: Dict[str, np.ndarray],
+    names: Iterable[str],
+    start_year: int = None,
+) -> Dict[str, pd.DataFrame]:
+    """Split a build_forecasts_batch result into {name: DataFrame} (same layout as build_forecast)."""
+    years = batch["Revenue"].shape[-1]
+    return {
+        name: _forecast_frame({col: arr[i] for col, arr in batch.items()}, years, start_year)
+        for i, name in enumerate(names)
+    }
 
 
 def build_scenario_from_base(
@@ -1,10 +1,73 @@
 # src/simulation.py
 
+import os
 import numpy as np
-import pandas as pd
+from scipy.stats import norm, qmc
 from typing import Dict
-from src.valuation import compute_dcf_value
-from src.forecasting import build_forecast
+from src.valuation import compute_dcf_value_closed_form
+
+def _sample_inputs(
+    n_sims: int,
+    base_inputs: Dict[str, float],
+    sigma_inputs: Dict[str, float],
+    wacc_base: float,
+    wacc_sigma: float,
+    terminal_g_base: float,
+    terminal_g_sigma: float,
+    rng: np.random.Generator,
+    sampler: str = "random"
+) -> Dict[str, np.ndarray]:
+    """
+    Draw n_sims samples of every MC input and apply the safety limits.
+    sampler: "random" (pseudo-random normals) or "sobol" (scrambled Sobol
+    points mapped through the normal inverse CDF; use a power of 2 for n_sims).
+    """
+
+    # ---- One (8, n_sims) standard-normal block, shifted/scaled per row ----
+    mus = np.array([
+        base_inputs["growth"],
+        base_inputs["ebitda_margin"],
+        base_inputs["capex_pct"],
+        base_inputs["dep_pct"],
+        base_inputs["wc_pct"],
+        base_inputs["tax_rate"],
+        wacc_base,
+        terminal_g_base,
+    ], dtype=float)
+    sds = np.array([
+        sigma_inputs.get("growth", 0),
+        sigma_inputs.get("ebitda_margin", 0),
+        sigma_inputs.get("capex_pct", 0),
+        sigma_inputs.get("dep_pct", 0),
+        sigma_inputs.get("wc_pct", 0),
+        sigma_inputs.get("tax_rate", 0),
+        wacc_sigma,
+        terminal_g_sigma,
+    ], dtype=float)
+    # row-major (8, n_sims) so each parameter unpacks as a contiguous row
+    if sampler == "random":
+        samples = rng.standard_normal((8, n_sims))
+    elif sampler == "sobol":
+        u = qmc.Sobol(d=8, scramble=True, seed=rng).random(n_sims)
+        samples = norm.ppf(np.ascontiguousarray(u.T))
+    else:
+        raise ValueError("sampler must be 'random' or 'sobol'")
+    samples *= sds[:, None]
+    samples += mus[:, None]
+    growth, ebitda_margin, capex_pct, dep_pct, wc_pct, tax_rate, wacc, terminal_g = samples
+    wacc = np.maximum(0.001, wacc)
+
+    # ---- Safety limits ----
+    return {
+        "growth": growth,
+        "ebitda_margin": np.maximum(-0.5, ebitda_margin),
+        "capex_pct": np.maximum(0.0, capex_pct),
+        "dep_pct": np.maximum(0.0, dep_pct),
+        "wc_pct": np.maximum(0.0, wc_pct),
+        "tax_rate": np.clip(tax_rate, 0.0, 1.0),
+        "wacc": wacc,
+        "terminal_g": terminal_g,
+    }
 
 def run_mc_simulation(
     n_sims: int,
@@ -16,7 +79,8 @@ def run_mc_simulation(
     wacc_sigma: float = 0.015,
     terminal_g_base: float = 0.025,  # Updated with realistic ASML LTG
     terminal_g_sigma: float = 0.005,
-    verbose: bool = False
+    verbose: bool = False,
+    sampler: str = "random"
 ) -> np.ndarray:
     """
     Monte Carlo simulation for enterprise value.
@@ -24,70 +88,37 @@ def run_mc_simulation(
         last_revenue, growth, ebitda_margin, capex_pct,
         dep_pct, wc_pct, tax_rate
     sigma_inputs must include stdev for each input.
+    sampler="sobol" uses quasi-Monte-Carlo points, which converge with far
+    fewer sims than the default pseudo-random draws.
+    All sims are computed at once as (n_sims,) NumPy arrays;
+    sims where WACC <= terminal growth come back as NaN.
     """
 
-    vals = np.zeros(n_sims)
     rng = np.random.default_rng()
+    samples = _sample_inputs(
+        n_sims, base_inputs, sigma_inputs,
+        wacc_base, wacc_sigma, terminal_g_base, terminal_g_sigma, rng, sampler
+    )
 
-    for i in range(n_sims):
+    # ---- Compute intrinsic value (closed form, no per-year arrays) ----
+    vals = compute_dcf_value_closed_form(
+        last_revenue=base_inputs["last_revenue"],
+        years=years,
+        **samples
+    )
 
-        # ---- Sample operational assumptions ----
-        growth = rng.normal(base_inputs["growth"], sigma_inputs.get("growth", 0))
+    if verbose:
+        print(f"[MC] Completed {n_sims} simulations ({int(np.isnan(vals).sum())} invalid)")
 
-        ebitda_margin = rng.normal(
-            base_inputs["ebitda_margin"],
-            sigma_inputs.get("ebitda_margin", 0)
-        )
-        capex_pct = rng.normal(
-            base_inputs["capex_pct"],
-            sigma_inputs.get("capex_pct", 0)
-        )
-        dep_pct = rng.normal(
-            base_inputs["dep_pct"],
-            sigma_inputs.get("dep_pct", 0)
-        )
-        wc_pct = rng.normal(
-            base_inputs["wc_pct"],
-            sigma_inputs.get("wc_pct", 0)
-        )
-        tax_rate = rng.normal(
-            base_inputs["tax_rate"],
-            sigma_inputs.get("tax_rate", 0)
-        )
+    return vals
 
-        # ---- Sample discounting assumptions ----
-        wacc = max(0.001, rng.normal(wacc_base, wacc_sigma))
-        terminal_g = rng.normal(terminal_g_base, terminal_g_sigma)
-
-        # ---- Safety limits ----
-        ebitda_margin = max(-0.5, ebitda_margin)
-        capex_pct = max(0.0, capex_pct)
-        dep_pct = max(0.0, dep_pct)
-        wc_pct = max(0.0, wc_pct)
-        tax_rate = min(max(0.0, tax_rate), 1.0)
-
-        # ---- Build forecast ----
-        forecast_df = build_forecast(
-            last_revenue=base_inputs["last_revenue"],
-            growth=growth,
-            ebitda_margin=ebitda_margin,
-            capex_pct=capex_pct,
-            dep_pct=dep_pct,
-            wc_pct=wc_pct,
-            tax_rate=tax_rate,
-            years=years,
-            start_year=start_year
-        )
-
-        # ---- Compute intrinsic value ----
-        try:
-            ev = compute_dcf_value(forecast_df, wacc=wacc, terminal_g=terminal_g)
-        except Exception:
-            ev = np.nan
-
-        vals[i] = ev
-
-        if verbose and i % 1000 == 0:
-            print(f"[MC] Completed {i} simulations")
-
-    return vals
\ No newline at end of file
+def save_mc_values(path: str, vals: np.ndarray) -> None:
+    """
+    Save MC values to `path` as a float32 .npy.
+    Writes a temp file and os.replace()s it, so a reader that has `path`
+    memory-mapped keeps its old (intact) file instead of a truncated one.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.asarray(vals).astype(np.float32))
+    os.replace(tmp_path, path)
\ No newline at end of file
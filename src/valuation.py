@@ -3,11 +3,14 @@ import numpy as np
 import pandas as pd
 from typing import Iterable, Tuple
 
-def calc_free_cash_flow(forecast_df: pd.DataFrame) -> pd.Series:
-    """Accepts a forecast DataFrame (as built by build_forecast) and returns FCFF series (index = Year)."""
+def calc_free_cash_flow(forecast_df: pd.DataFrame, coerce: bool = True) -> pd.Series:
+    """Accepts a forecast DataFrame (as built by build_forecast) and returns FCFF series (index = Year).
+    coerce=True turns non-numeric entries into NaN; coerce=False casts to float and raises on them."""
     if "FCFF" not in forecast_df.columns:
         raise ValueError("forecast_df must contain 'FCFF' column")
-    return pd.to_numeric(forecast_df["FCFF"], errors="coerce")
+    if coerce:
+        return pd.to_numeric(forecast_df["FCFF"], errors="coerce")
+    return forecast_df["FCFF"].astype(float)
 
 def wacc_calc(
     beta: float,
@@ -41,7 +44,7 @@ def discount_cash_flows(fcfs: Iterable[float], wacc: float) -> Tuple[float, np.n
     Discount an iterable of FCFF for years 1..n at constant WACC.
     Returns (pv_sum, discount_factors_array)
     """
-    fcfs_arr = np.asarray(list(fcfs), dtype=float)
+    fcfs_arr = np.asarray(fcfs if isinstance(fcfs, np.ndarray) else list(fcfs), dtype=float)
     n = fcfs_arr.shape[0]
     # discount factors for year i: (1+wacc)**i for i=1..n
     discount_factors = (1.0 + wacc) ** np.arange(1, n + 1)
@@ -57,23 +60,79 @@ def terminal_value_gordon(fcff_last: float, wacc: float, g: float) -> float:
         raise ValueError("WACC must be greater than terminal growth g")
     return float((fcff_last * (1 + g)) / (wacc - g))
 
-def compute_dcf_value(
-    forecast_df: pd.DataFrame,
+def compute_dcf_value_from_array(
+    fcff: np.ndarray,
     wacc: float,
     terminal_g: float
 ) -> float:
     """
-    Computes enterprise value using FCFF in forecast_df and terminal value.
-    Assumes forecast_df index or 'Year' column is sequential for projection years
+    Computes enterprise value from a raw FCFF array for projection years 1..n.
     Returns enterprise_value (PV of FCFF + PV terminal)
     """
-    fcfs = calc_free_cash_flow(forecast_df).values
+    fcfs = np.asarray(fcff, dtype=float)
     pv_fcfs, discount_factors = discount_cash_flows(fcfs, wacc)
     # last year's FCFF (most recent forecast year)
     fcff_last = float(fcfs[-1])
     tv = terminal_value_gordon(fcff_last, wacc, terminal_g)
-    # PV of TV discounted by (1+wacc)**n where n = len(fcfs)
-    n = len(fcfs)
-    pv_tv = tv / ((1.0 + wacc) ** n)
+    # PV of TV discounted by (1+wacc)**n, which is the last discount factor
+    pv_tv = tv / discount_factors[-1]
     enterprise_value = pv_fcfs + pv_tv
-    return float(enterprise_value)
\ No newline at end of file
+    return float(enterprise_value)
+
+def compute_dcf_value(
+    forecast_df: pd.DataFrame,
+    wacc: float,
+    terminal_g: float
+) -> float:
+    """
+    Computes enterprise value using FCFF in forecast_df and terminal value.
+    Assumes forecast_df index or 'Year' column is sequential for projection years
+    Returns enterprise_value (PV of FCFF + PV terminal)
+    """
+    fcfs = calc_free_cash_flow(forecast_df, coerce=False).to_numpy()
+    return compute_dcf_value_from_array(fcfs, wacc, terminal_g)
+
+def compute_dcf_value_closed_form(
+    last_revenue: float,
+    growth,
+    ebitda_margin,
+    capex_pct,
+    dep_pct,
+    wc_pct,
+    tax_rate,
+    wacc,
+    terminal_g,
+    years: int
+):
+    """
+    Enterprise value of a build_forecast-style projection without building it.
+    FCFF_i = R0*(1+g)^i * k with k = margin*(1-tax) + dep*tax - capex - wc, so
+    the PV of years 1..n is a geometric sum in r = (1+g)/(1+wacc).
+    Accepts scalars or broadcastable arrays (e.g. one entry per MC sim).
+    Entries with wacc <= terminal_g are returned as NaN.
+    """
+    growth = np.asarray(growth, dtype=float)
+    wacc = np.asarray(wacc, dtype=float)
+    terminal_g = np.asarray(terminal_g, dtype=float)
+    k = (
+        np.asarray(ebitda_margin) * (1 - np.asarray(tax_rate))
+        + np.asarray(dep_pct) * np.asarray(tax_rate)
+        - np.asarray(capex_pct)
+        - np.asarray(wc_pct)
+    )
+    # d = r - 1 taken directly from (g - wacc) so it carries no cancellation error
+    d = (growth - wacc) / (1.0 + wacc)
+    r = 1.0 + d
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # r^n - 1: expm1/log1p stays accurate as r -> 1 but needs r > 0 (growth > -100%);
+        # for r <= 0 there is no cancellation to avoid, so use the power directly
+        r_n_minus_1 = np.where(d > -1.0, np.expm1(years * np.log1p(d)), r ** years - 1.0)
+        r_n = 1.0 + r_n_minus_1
+        # r*(r^n-1)/(r-1), exactly n at r == 1
+        geo_sum = np.where(d == 0.0, float(years), r * r_n_minus_1 / d)
+        tv_factor = r_n * (1 + terminal_g) / (wacc - terminal_g)
+    tv_factor = np.where(wacc > terminal_g, tv_factor, np.nan)
+    enterprise_value = last_revenue * k * (geo_sum + tv_factor)
+    if enterprise_value.ndim == 0:
+        return float(enterprise_value)
+    return enterprise_value
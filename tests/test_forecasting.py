@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.forecasting import build_forecast, build_forecasts_batch, split_forecast_batch
+
+
+def test_batch_matches_individual_forecasts():
+    growths = [0.19, 0.2375, 0.1425]
+    margins = [0.349, 0.369, 0.319]
+    capex = [0.072, 0.0756, 0.0684]
+    wc = [0.029, 0.029, 0.0319]
+    batch = build_forecasts_batch(28262.9, growths, margins, capex, 0.031, wc, 0.165, years=5)
+    assert batch["FCFF"].shape == (3, 5)
+
+    frames = split_forecast_batch(batch, ["Base", "Bull", "Bear"], start_year=2024)
+    for i, name in enumerate(["Base", "Bull", "Bear"]):
+        expected = build_forecast(28262.9, growths[i], margins[i], capex[i], 0.031, wc[i], 0.165, 5, 2024)
+        assert frames[name].equals(expected)
+
+
+def test_all_scalar_drivers_give_single_scenario():
+    batch = build_forecasts_batch(100.0, 0.1, 0.3, 0.05, 0.03, 0.02, 0.2, years=4)
+    assert all(arr.shape == (1, 4) for arr in batch.values())
+
+    frames = split_forecast_batch(batch, ["Only"])
+    expected = build_forecast(100.0, 0.1, 0.3, 0.05, 0.03, 0.02, 0.2, 4)
+    assert frames["Only"].equals(expected)
+    np.testing.assert_allclose(frames["Only"]["Revenue"], 100.0 * 1.1 ** np.arange(1, 5))
+
+
+def test_mismatched_driver_lengths_raise():
+    with pytest.raises(ValueError):
+        build_forecasts_batch(100.0, [0.1, 0.2], [0.3, 0.3, 0.3], 0.05, 0.03, 0.02, 0.2, years=4)
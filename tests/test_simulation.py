@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from src.simulation import _sample_inputs, run_mc_simulation, save_mc_values
+from src.valuation import compute_dcf_value_closed_form
+
+BASE_INPUTS = {
+    "last_revenue": 28262.9,
+    "growth": 0.19,
+    "ebitda_margin": 0.349,
+    "capex_pct": 0.072,
+    "dep_pct": 0.031,
+    "wc_pct": 0.029,
+    "tax_rate": 0.165,
+}
+SIGMA_INPUTS = {
+    "growth": 0.01,
+    "ebitda_margin": 0.03,
+    "capex_pct": 0.02,
+    "dep_pct": 0.01,
+    "wc_pct": 0.01,
+    "tax_rate": 0.02,
+}
+
+
+def test_save_mc_values_keeps_existing_memmap_valid(tmp_path):
+    path = str(tmp_path / "mc_values_live_eur.npy")
+    np.save(path, np.arange(100_000, dtype=np.float64))
+    old = np.load(path, mmap_mode="r")
+
+    # a smaller rewrite must not truncate the file under the existing mapping
+    save_mc_values(path, np.arange(10, dtype=np.float64))
+
+    assert np.sort(np.asarray(old))[-1] == 99_999.0
+    new = np.load(path)
+    assert new.dtype == np.float32
+    np.testing.assert_array_equal(new, np.arange(10))
+    assert not (tmp_path / "mc_values_live_eur.npy.tmp").exists()
+
+
+def test_numba_kernel_matches_closed_form():
+    pytest.importorskip("numba")
+    from src.simulation_numba import _mc_kernel
+
+    # wide sigmas so the draws include wacc <= terminal_g and growth below -100%
+    sigmas = {k: v * 40 for k, v in SIGMA_INPUTS.items()}
+    samples = _sample_inputs(
+        20_000, BASE_INPUTS, sigmas, 0.075, 0.03, 0.025, 0.02, np.random.default_rng(42)
+    )
+    assert (samples["wacc"] <= samples["terminal_g"]).any()
+    assert (samples["growth"] < -1).any()
+
+    expected = compute_dcf_value_closed_form(
+        last_revenue=BASE_INPUTS["last_revenue"], years=5, **samples
+    )
+    out = np.empty(20_000)
+    _mc_kernel(
+        BASE_INPUTS["last_revenue"],
+        samples["growth"],
+        samples["ebitda_margin"],
+        samples["capex_pct"],
+        samples["dep_pct"],
+        samples["wc_pct"],
+        samples["tax_rate"],
+        samples["wacc"],
+        samples["terminal_g"],
+        5,
+        out,
+    )
+    np.testing.assert_array_equal(np.isnan(out), np.isnan(expected))
+    np.testing.assert_allclose(out, expected, rtol=1e-9, equal_nan=True)
+
+
+def test_sobol_sampler_matches_random_sampler():
+    n_sims = 2 ** 14
+    sobol = run_mc_simulation(n_sims, BASE_INPUTS, SIGMA_INPUTS, sampler="sobol")
+    random = run_mc_simulation(n_sims, BASE_INPUTS, SIGMA_INPUTS, sampler="random")
+    assert sobol.shape == (n_sims,)
+    assert np.nanmedian(sobol) == pytest.approx(np.nanmedian(random), rel=0.02)
+
+
+def test_unknown_sampler_raises():
+    with pytest.raises(ValueError, match="sampler"):
+        run_mc_simulation(16, BASE_INPUTS, SIGMA_INPUTS, sampler="bogus")
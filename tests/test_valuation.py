@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src.forecasting import build_forecast
+from src.valuation import compute_dcf_value, compute_dcf_value_closed_form
+
+
+def _reference_ev(last_revenue, growth, margin, capex, dep, wc, tax, wacc, tg, years):
+    df = build_forecast(last_revenue, growth, margin, capex, dep, wc, tax, years)
+    return compute_dcf_value(df, wacc=wacc, terminal_g=tg)
+
+
+def test_closed_form_matches_forecast_dcf_on_random_inputs():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        years = int(rng.integers(1, 11))
+        inputs = dict(
+            last_revenue=rng.uniform(100, 50_000),
+            growth=rng.normal(0.08, 0.1),
+            ebitda_margin=rng.uniform(-0.2, 0.6),
+            capex_pct=rng.uniform(0, 0.15),
+            dep_pct=rng.uniform(0, 0.1),
+            wc_pct=rng.uniform(0, 0.1),
+            tax_rate=rng.uniform(0, 0.4),
+        )
+        wacc = rng.uniform(0.03, 0.15)
+        tg = wacc - rng.uniform(0.001, 0.05)
+        expected = _reference_ev(*inputs.values(), wacc, tg, years)
+        got = compute_dcf_value_closed_form(**inputs, wacc=wacc, terminal_g=tg, years=years)
+        assert got == pytest.approx(expected, rel=1e-10, abs=1e-6)
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e-15, 1e-12, 1e-9, 1e-6, 1e-3])
+def test_closed_form_accurate_when_growth_equals_wacc(offset):
+    wacc = 0.08
+    growth = (1 + wacc) * (1 + offset) - 1  # r = (1+g)/(1+wacc) just above 1
+    args = (28_000.0, growth, 0.35, 0.07, 0.03, 0.03, 0.16)
+    expected = _reference_ev(*args, wacc, 0.025, 5)
+    got = compute_dcf_value_closed_form(*args, wacc=wacc, terminal_g=0.025, years=5)
+    assert got == pytest.approx(expected, rel=1e-12)
+
+
+def test_closed_form_returns_nan_when_wacc_not_above_terminal_growth():
+    args = (28_000.0, 0.1, 0.35, 0.07, 0.03, 0.03, 0.16)
+    with pytest.raises(ValueError):
+        _reference_ev(*args, 0.03, 0.03, 5)
+    assert np.isnan(compute_dcf_value_closed_form(*args, wacc=0.03, terminal_g=0.03, years=5))
+
+    vals = compute_dcf_value_closed_form(
+        *args, wacc=np.array([0.08, 0.03, 0.02]), terminal_g=np.array([0.025, 0.03, 0.025]), years=5
+    )
+    assert np.isfinite(vals[0])
+    assert np.isnan(vals[1:]).all()
+
+
+@pytest.mark.parametrize("growth", [-1.5, -1.2, -1.0, -0.99])
+def test_closed_form_handles_growth_at_or_below_minus_100pct(growth):
+    args = (100.0, growth, 0.3, 0.05, 0.03, 0.02, 0.2)
+    expected = _reference_ev(*args, 0.08, 0.02, 5)
+    with np.errstate(all="raise"):
+        got = compute_dcf_value_closed_form(*args, wacc=0.08, terminal_g=0.02, years=5)
+    assert np.isfinite(got)
+    assert got == pytest.approx(expected, rel=1e-10, abs=1e-12)
+
+
+def test_compute_dcf_value_rejects_missing_or_non_numeric_fcff():
+    df = build_forecast(100.0, 0.1, 0.3, 0.05, 0.03, 0.02, 0.2, 5)
+    with pytest.raises(ValueError, match="FCFF"):
+        compute_dcf_value(df.drop(columns="FCFF"), wacc=0.08, terminal_g=0.02)
+    df["FCFF"] = df["FCFF"].astype(object)
+    df.loc[df.index[0], "FCFF"] = "n/a"
+    with pytest.raises(ValueError):
+        compute_dcf_value(df, wacc=0.08, terminal_g=0.02)